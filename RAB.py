@@ -2,7 +2,7 @@ import streamlit as st
 import pandas as pd
 import numpy as np
 import gspread
-from gspread_dataframe import get_as_dataframe, set_with_dataframe
+from gspread_dataframe import set_with_dataframe
 from google.oauth2.service_account import Credentials
 import time
 import hashlib
@@ -11,74 +11,250 @@ import requests
 import base64
 from PIL import Image
 from io import BytesIO
+from employee_lookup import build_employee_lookup, search_employee_lookup
+from sheets_access import SheetsGateway, fetch_sheets, load_snapshot, save_snapshot
 
+#######################################
+# --- Boards ---
+#######################################
+
+# Each board is one Google Sheet plus its account -> owner mapping. Boards can be
+# overridden with a [boards.<id>] table per board in Streamlit secrets, and are
+# selected with the ?board=<id> query parameter.
+DEFAULT_BOARD = "default"
+BOARD_DEFAULTS = {
+    "name": "mu Ghumao Board",
+    "employee_sheet": "Employee Data",
+    "ads_sheet": "Employee ADS",
+    "ttl": 60,    # seconds before a board's data is re-read from Sheets
+}
+BOARDS = {
+    DEFAULT_BOARD: {
+        "sheet_id": "1yagvN3JhJtml0CMX4Lch7_LdPeUzvPcl1VEfyy8RvC4",
+        "accounts": {
+            "Account": [
+                "Bristol-Myers Squibb",
+                "J&J",
+                "Abbvie",
+                "Gilead Sciences  Inc.",
+                "RECURSION",
+                "Novartis",
+                "Sanofi",
+                "Abbott Laboratories",
+                "Loyalty Pacific",
+                "Coles"
+            ],
+            "Delivery Owner": [
+                "Riddhi J Katira",
+                "Sana Aram",
+                "Aneesha Bijju",
+                "Aviral Tiwari",
+                "Saaketh Ram",
+                "Satyananda Palui",
+                "Satyananda Palui",
+                "Satyananda Palui",
+                "Aviral Bhargava",
+                "Aviral Bhargava"
+            ],
+            "P&L Owner Mapping": [
+                "Shilpa P Bhat",
+                "Rajdeep Roy Choudhury",
+                "Nivedhan Narasimhan",
+                "Nivedhan Narasimhan",
+                "Nivedhan Narasimhan",
+                "Shilpa P Bhat",
+                "Tanmay Sengupta",
+                "Tanmay Sengupta",
+                "Shilpa P Bhat",
+                "Shilpa P Bhat"
+            ]
+        }
+    }
+}
+ACCOUNT_COLUMNS = ["Account", "Delivery Owner", "P&L Owner Mapping"]
+
+
+def board_config_errors(board_id, board):
+    """
+    Describe what is missing or malformed in one board's configuration.
+    """
+    errors = [f"Board '{board_id}' has no '{key}'" for key in ("sheet_id", "accounts") if not board.get(key)]
+    accounts = board.get("accounts")
+    if accounts and not isinstance(accounts, dict):
+        errors.append(f"Board '{board_id}': 'accounts' must be a table of {', '.join(ACCOUNT_COLUMNS)} lists")
+    elif accounts:
+        missing = [col for col in ACCOUNT_COLUMNS if col not in accounts]
+        if missing:
+            errors.append(f"Board '{board_id}': 'accounts' is missing {', '.join(missing)}")
+        elif len({len(accounts[col]) for col in ACCOUNT_COLUMNS}) > 1:
+            errors.append(f"Board '{board_id}': the 'accounts' lists must all be the same length")
+    return errors
+
+
+if "boards" in st.secrets:
+    BOARDS = st.secrets["boards"].to_dict()
+BOARDS = {board_id: {**BOARD_DEFAULTS, **board} for board_id, board in BOARDS.items()}
+board_errors = [error for board_id, board in BOARDS.items() for error in board_config_errors(board_id, board)]
+
+board_id = st.query_params.get("board", DEFAULT_BOARD if DEFAULT_BOARD in BOARDS else next(iter(BOARDS)))
+board = BOARDS.get(board_id)
+
+# set_page_config comes before any other element, so errors are shown below it
 st.set_page_config(
-    page_title="mu Ghumao Board",  # <-- Browser tab name
+    page_title=board["name"] if board else BOARD_DEFAULTS["name"],  # <-- Browser tab name
     page_icon="🧑‍💼",                            # <-- Favicon in browser tab
     layout="wide"                              # optional
 )
 
+if board_errors:
+    st.error("❌ The boards configuration is invalid:\n\n" + "\n".join(f"- {error}" for error in board_errors))
+    st.stop()
+if board is None:
+    st.error(f"❌ Unknown board '{board_id}'. Available boards: {', '.join(BOARDS)}")
+    st.stop()
+
+# # --- Google Sheet ID & Sheet Names ---
+SHEET_ID = board["sheet_id"]
+EMPLOYEE_SHEET_NAME = board["employee_sheet"]
+ADS_SHEET_NAME = board["ads_sheet"]
+
 #######################################
 # --- Google Sheets Connection ---
 #######################################
 
 # --- Connect to Google Sheets using Streamlit secrets ---
-service_account_info = st.secrets["google_service_account"]
-scopes = ["https://www.googleapis.com/auth/spreadsheets", "https://www.googleapis.com/auth/drive"]
-credentials = Credentials.from_service_account_info(service_account_info, scopes=scopes)
-gc = gspread.authorize(credentials)
+@st.cache_resource
+def get_sheets_client():
+    # One authorized client (and HTTP connection pool) shared by every session and board
+    service_account_info = st.secrets["google_service_account"]
+    scopes = ["https://www.googleapis.com/auth/spreadsheets", "https://www.googleapis.com/auth/drive"]
+    credentials = Credentials.from_service_account_info(service_account_info, scopes=scopes)
+    return gspread.authorize(credentials)
 
-# # --- Google Sheet ID & Sheet Names ---
-SHEET_ID = "1yagvN3JhJtml0CMX4Lch7_LdPeUzvPcl1VEfyy8RvC4"
-EMPLOYEE_SHEET_NAME = "Employee Data"
-ADS_SHEET_NAME = "Employee ADS"
+gc = get_sheets_client()
+
+#######################################
+# --- Sheets Access Layer ---
+#######################################
+
+# All Sheets calls go through one gateway shared by every session (see sheets_access.py)
+@st.cache_resource
+def get_sheets_gateway():
+    return SheetsGateway()
+
+sheets = get_sheets_gateway()
+
+
+#######################################
+# --- Local Snapshots ---
+#######################################
+
+# Every successful load is kept on disk as Arrow IPC files (one per worksheet),
+# so a restarted process can render at once while it refreshes from Sheets
+# (see sheets_access.py). Set RAB_SNAPSHOT_DIR to keep them elsewhere.
+SNAPSHOT_DIR = os.environ.get(
+    "RAB_SNAPSHOT_DIR", os.path.join(os.path.dirname(os.path.abspath(__file__)), ".snapshots")
+)
+
+
+def sheets_fetcher(sheet_id, sheet_names):
+    """
+    Return a fetch() that reads the worksheets in one values_batch_get round
+    trip and snapshots the result.
+    """
+    def fetch():
+        frames = fetch_sheets(gc, sheet_id, sheet_names)
+        save_snapshot(SNAPSHOT_DIR, sheet_id, sheet_names, frames, time.time())
+        return frames
+
+    return fetch
+
+
+def board_sheets(board):
+    return (board["employee_sheet"], board["ads_sheet"])
+
+
+def board_key(board):
+    return (board["sheet_id"],) + board_sheets(board)
+
+
+def read_sheets(sheet_id, sheet_names, max_age=None):
+    """
+    Read several worksheets through the gateway. Each session gets its own
+    copies. Data read less than max_age seconds ago is reused.
+
+    Returns (frames, data_as_of). data_as_of is None for current data, and
+    the load time when older data is served: a snapshot while this process
+    has no data yet (a background refresh is started), or the gateway's last
+    good result while it is backing off or out of budget.
+    """
+    sheet_names = tuple(sheet_names)
+    key = (sheet_id,) + sheet_names
+    fetch = sheets_fetcher(sheet_id, sheet_names)
+
+    # open_by_key + values_batch_get = 2 requests
+    if not sheets.has(key):
+        snapshot = load_snapshot(SNAPSHOT_DIR, sheet_id, sheet_names)
+        if snapshot is not None:
+            sheets.refresh(key, fetch, cost=2)
+            return snapshot
+
+    frames, as_of = sheets.read(key, fetch, cost=2, max_age=max_age)
+    return [frame.copy() for frame in frames], as_of
+
+
+@st.cache_resource
+def load_all_boards():
+    # Runs once per process: start loading every board concurrently
+    for board in BOARDS.values():
+        sheets.refresh(board_key(board), sheets_fetcher(board["sheet_id"], board_sheets(board)), cost=2)
+
+
+def frame_fingerprint(frame):
+    """
+    Content hash of a DataFrame, including its column names.
+    """
+    return hash((tuple(frame.columns), int(pd.util.hash_pandas_object(frame).sum())))
+
+
+def write_ads_sheet(frame, clear=False, **options):
+    """
+    Write the ADS worksheet through the gateway.
+    """
+    # Never overwrite the sheet with snapshot or stale data
+    if data_as_of is not None:
+        raise RuntimeError("The board is showing older data while it waits on Google Sheets. Please click Refresh in a moment and try again.")
+
+    # The write replaces the whole sheet, so it must be based on what is in Sheets
+    # right now rather than on cached data: another replica may have written since
+    key = board_key(board)
+    fetch = sheets_fetcher(SHEET_ID, board_sheets(board))
+    _, current_ads_df = sheets.read_fresh(key, fetch, cost=2)
+    if frame_fingerprint(current_ads_df) != ads_fingerprint:
+        raise RuntimeError("Transfer requests were changed elsewhere since this page loaded. Please click Refresh and try again.")
+
+    def push():
+        ads_sheet = gc.open_by_key(SHEET_ID).worksheet(ADS_SHEET_NAME)
+        if clear:
+            ads_sheet.clear()
+        set_with_dataframe(ads_sheet, frame, **options)
+
+    sheets.write(push, cost=5)
+    # Re-read so the next rerun shows this write even if the gateway is short on budget
+    sheets.read_fresh(key, fetch, cost=2)
 
-employee_sheet = gc.open_by_key(SHEET_ID).worksheet(EMPLOYEE_SHEET_NAME)
-ads_sheet = gc.open_by_key(SHEET_ID).worksheet(ADS_SHEET_NAME)
 
 # --- Load Data ---
-df = get_as_dataframe(employee_sheet, evaluate_formulas=True).dropna(how="all")
-ads_df = get_as_dataframe(ads_sheet, evaluate_formulas=True).dropna(how="all")
-
-# Define the data
-data = {
-    "Account": [
-        "Bristol-Myers Squibb",
-        "J&J",
-        "Abbvie",
-        "Gilead Sciences  Inc.",
-        "RECURSION",
-        "Novartis",
-        "Sanofi",
-        "Abbott Laboratories",
-        "Loyalty Pacific",
-        "Coles"
-    ],
-    "Delivery Owner": [
-        "Riddhi J Katira",
-        "Sana Aram",
-        "Aneesha Bijju",
-        "Aviral Tiwari",
-        "Saaketh Ram",
-        "Satyananda Palui",
-        "Satyananda Palui",
-        "Satyananda Palui",
-        "Aviral Bhargava",
-        "Aviral Bhargava"
-    ],
-    "P&L Owner Mapping": [
-        "Shilpa P Bhat",
-        "Rajdeep Roy Choudhury",
-        "Nivedhan Narasimhan",
-        "Nivedhan Narasimhan",
-        "Nivedhan Narasimhan",
-        "Shilpa P Bhat",
-        "Tanmay Sengupta",
-        "Tanmay Sengupta",
-        "Shilpa P Bhat",
-        "Shilpa P Bhat"
-    ]
-}
+load_all_boards()
+try:
+    (df, ads_df), data_as_of = read_sheets(SHEET_ID, board_sheets(board), max_age=board["ttl"])
+    ads_fingerprint = frame_fingerprint(ads_df)
+except Exception as e:
+    st.error(f"❌ Could not load data from Google Sheets: {e}")
+    st.stop()
+
+# Account -> Delivery Owner / P&L Owner mapping for this board
+data = board["accounts"]
 account_df = pd.DataFrame(data)
 
 df = df.merge(
@@ -145,6 +321,30 @@ def fetch_employee_url(emp_id):
     except Exception as e:
         return DEFAULT_IMAGE_URL
         
+#######################################
+# --- Employee Typeahead ---
+#######################################
+# The prefix index and its search live in employee_lookup.py
+@st.cache_resource(max_entries=8, show_spinner=False)
+def get_employee_lookup(employees):
+    # Cached on the data itself, so the index is built once per data version
+    return build_employee_lookup(employees)
+
+
+def employee_typeahead(label, lookup, key, placeholder, preselected=None):
+    """
+    Search box plus a selectbox holding only the top matches, so the full
+    employee list never goes to the browser.
+    """
+    query = st.text_input(label, key=f"{key}_query", placeholder="Type Employee ID or Name")
+    matches = search_employee_lookup(lookup, query)
+
+    # Keep the current (or preselected) choice available while the query changes
+    pinned = [o for o in (preselected, st.session_state.get(key)) if o and o != placeholder and o in lookup[0]]
+    options = [placeholder] + list(dict.fromkeys(pinned + matches))
+    index = options.index(preselected) if preselected in options else 0
+    return st.selectbox(label, options=options, key=key, index=index, label_visibility="collapsed")
+
 #######################################
 # --- Page Navigation Setup ---
 #######################################
@@ -155,11 +355,19 @@ if "active_page" not in st.session_state:
 header_col1, header_col2 = st.columns([6, 1])
 
 with header_col1:
-    st.markdown("<h1 style='text-align:center'>🧑‍💼 mu Ghumao Board</h1>", unsafe_allow_html=True)
+    st.markdown(f"<h1 style='text-align:center'>🧑‍💼 {board['name']}</h1>", unsafe_allow_html=True)
+    if data_as_of is not None:
+        st.markdown(
+            f"<p style='text-align:center; color:#b0b0b0; font-size:14px; font-style:italic;'>"
+            f"🕒 Data as of {time.strftime('%d %b %Y %H:%M', time.localtime(data_as_of))}, waiting on Google Sheets for fresh data"
+            f"</p>",
+            unsafe_allow_html=True
+        )
 
 with header_col2:
     st.markdown("<br>", unsafe_allow_html=True)
     if st.button("🔄 Refresh"):
+        sheets.invalidate(board_key(board))
         st.rerun()
         
 
@@ -403,6 +611,14 @@ elif st.session_state["active_page"] == "Supply Pool":
     columns_to_show = ["Delivery Owner", "P&L Owner Mapping", "Account Name", "Employee Id", "Employee Name", "Designation", "Rank", "Skillset"]
     columns_to_show = [col for col in columns_to_show if col in filtered_df_unique.columns]
 
+    # --- Employees already involved in an approved transfer (once per rerun, by Employee Id) ---
+    approved_employee_ids = set()
+    if {"Employee Id", "Employee to Swap", "Status"}.issubset(ads_df.columns):
+        approved_requests = ads_df[ads_df["Request Id"].notna() & (ads_df["Status"] == "Approved")]
+        approved_employee_ids.update(approved_requests["Employee Id"].dropna().astype(str))
+        swapped_employees = df[df["Employee Name"].isin(approved_requests["Employee to Swap"].dropna())]
+        approved_employee_ids.update(swapped_employees["Employee Id"].astype(str))
+
     # --- Display Employee Cards ---
     if not filtered_df_unique.empty:
         sorted_df = filtered_df_unique[columns_to_show].sort_values(by="Employee Name").reset_index(drop=True)
@@ -445,22 +661,8 @@ elif st.session_state["active_page"] == "Supply Pool":
                                 )
 
                                 # --- Interested in Employee button ---
-                                dum_ads_df = ads_df.copy()
-                                dum_ads_df = dum_ads_df[dum_ads_df["Request Id"].notna()]
-
                                 if st.button("Interested in Employee", key=f"interested_{row['Employee Id']}"):
-                                    emp_name = row['Employee Name']
-
-                                    if {"Employee Name", "Employee to Swap", "Status"}.issubset(dum_ads_df.columns):
-                                        approved_check = dum_ads_df[dum_ads_df["Status"] == "Approved"]
-                                        approved_check = approved_check[
-                                            (approved_check["Employee Name"] == emp_name) |
-                                            (approved_check["Employee to Swap"] == emp_name)
-                                        ]
-                                    else:
-                                        approved_check = pd.DataFrame()
-
-                                    if approved_check.empty:
+                                    if str(row['Employee Id']) not in approved_employee_ids:
                                         st.session_state["preselect_interested_employee"] = f"{row['Employee Id']} - {row['Employee Name']}"
                                         st.session_state["active_page"] = "Employee Transfer Form"
                                         st.rerun()
@@ -604,7 +806,7 @@ elif st.session_state["active_page"] == "Transfer Requests":
                         ] = "Rejected"
                         
                     # Save updates to Google Sheet
-                    set_with_dataframe(ads_sheet, ads_df, include_index=False, resize=True)
+                    write_ads_sheet(ads_df, include_index=False, resize=True)
                     msg_placeholder.success(f"✅ Request ID {request_id_select} marked as {status_value}, related pending requests updated accordingly.")
                     time.sleep(1)
                     st.rerun()
@@ -676,23 +878,7 @@ elif st.session_state["active_page"] == "Employee Transfer Form":
         (~df["Designation"].isin(["AL"]))
     ].copy()
     
-    options_interested = ["Select Interested Employee"] + (available_employees["Employee Id"].astype(str) + " - " + available_employees["Employee Name"]).tolist()
-    # Create options for swap, removing the preselected employee
-    options_swap = ["Select Employee to Swap"] + (available_employees["Employee Id"].astype(str) + " - " + available_employees["Employee Name"]).tolist()
-       
-    # Pre-fill if selected from Tab 1
-
     preselected = st.session_state.get("preselect_interested_employee", None)
-    #default_idx = options_interested.index(preselected) if preselected in options_interested else 0
-    # Dropdown
-    options_interested = ["Select Interested Employee"] + (available_employees["Employee Id"].astype(str) + " - " + available_employees["Employee Name"]).dropna().tolist()
-    default_idx = options_interested.index(preselected) if preselected in options_interested else 0
-
-    # --- Handle session state for dropdowns ---
-    # if "interested_employee_add" not in st.session_state:
-    #     st.session_state["interested_employee_add"] = preselected if preselected else "Select Interested Employee"
-    # if "employee_to_swap_add" not in st.session_state:
-    #     st.session_state["employee_to_swap_add"] = "Select Employee to Swap"   
 
     # --- Dropdowns ---
     col1, col2, col3 = st.columns([1, 2, 2])
@@ -703,17 +889,19 @@ elif st.session_state["active_page"] == "Employee Transfer Form":
             key="user_name_add"
         )
     with col2:
-        interested_employee_add = st.selectbox(
+        interested_employee_add = employee_typeahead(
             "Interested Employee",
-            options=options_interested,
+            get_employee_lookup(available_employees[["Employee Id", "Employee Name"]]),
             key="interested_employee_add",
-            index = default_idx
+            placeholder="Select Interested Employee",
+            preselected=preselected
         )
     with col3:
-        employee_to_swap_add = st.selectbox(
+        employee_to_swap_add = employee_typeahead(
             "Employee to Transfer",
-            options=["Select Employee to Swap"] + (df["Employee Id"].astype(str) + " - " + df["Employee Name"]).dropna().tolist(),
-            key="employee_to_swap_add"
+            get_employee_lookup(df[["Employee Id", "Employee Name"]]),
+            key="employee_to_swap_add",
+            placeholder="Select Employee to Swap"
         )
 
     # Remove session_state preselection after use
@@ -759,7 +947,7 @@ elif st.session_state["active_page"] == "Employee Transfer Form":
                     ads_df = pd.concat([ads_df, employee_row], ignore_index=True)
                     ads_df = ads_df.drop_duplicates(subset=["Employee Id","Interested Manager","Employee to Swap"], keep="last")
 
-                    set_with_dataframe(ads_sheet, ads_df)
+                    write_ads_sheet(ads_df)
 
                     # Preselect this employee on rerun
                     st.session_state["preselect_interested_employee"] = f"{interested_emp_id} - {interested_employee_add.split(' - ')[1]}"
@@ -787,12 +975,14 @@ elif st.session_state["active_page"] == "Employee Transfer Form":
             st.warning("⚠️ Please enter a Request ID before submitting.")
         else:
             if request_id_remove in ads_df["Request Id"].values:
-                ads_df = ads_df[ads_df["Request Id"] != request_id_remove]
-                ads_sheet.clear()
-                set_with_dataframe(ads_sheet, ads_df)
-                st.success(f"✅ Swap request with Request ID {request_id_remove} has been removed.")
-                time.sleep(1)
-                st.rerun()
+                try:
+                    ads_df = ads_df[ads_df["Request Id"] != request_id_remove]
+                    write_ads_sheet(ads_df, clear=True)
+                    st.success(f"✅ Swap request with Request ID {request_id_remove} has been removed.")
+                    time.sleep(1)
+                    st.rerun()
+                except Exception as e:
+                    st.error(f"Error: {e}")
             else:
                 st.error(f"❌ Request ID {request_id_remove} not found.")
 
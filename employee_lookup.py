@@ -0,0 +1,45 @@
+"""
+Employee typeahead search: a sorted prefix index over "Id - Name" options,
+searched with bisect so each keystroke only touches the matching entries.
+"""
+import bisect
+
+# Most options a search returns, and so the most sent to the browser
+TYPEAHEAD_LIMIT = 20
+
+
+def build_employee_lookup(employees):
+    """
+    Build "Id - Name" option strings and a sorted prefix index over them.
+    """
+    employees = employees.dropna(subset=["Employee Name"])
+    options = (employees["Employee Id"].astype(str) + " - " + employees["Employee Name"].astype(str)).tolist()
+
+    # Index the full option (ID prefix), the full name and every later word of the name
+    index = []
+    for i, option in enumerate(options):
+        option = option.lower()
+        name = option.split(" - ", 1)[1]
+        index.append((option, i))
+        index.append((name, i))
+        for word in name.split()[1:]:
+            index.append((word, i))
+    index.sort()
+    return options, index
+
+
+def search_employee_lookup(lookup, query, limit=TYPEAHEAD_LIMIT):
+    """
+    Return up to `limit` options whose ID or any name word starts with query.
+    """
+    options, index = lookup
+    query = query.strip().lower()
+    if not query:
+        return options[:limit]
+
+    found = set()
+    pos = bisect.bisect_left(index, (query,))
+    while pos < len(index) and len(found) < limit and index[pos][0].startswith(query):
+        found.add(index[pos][1])
+        pos += 1
+    return [options[i] for i in sorted(found)]
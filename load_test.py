@@ -0,0 +1,375 @@
+"""
+Load-test harness for RAB.py.
+
+Drives the real script headlessly with Streamlit's AppTest across many
+simulated sessions inside one process (i.e. one replica). Google Sheets and
+the employee image API are replaced by in-memory fakes with configurable
+latency, so no credentials or network access are needed.
+
+Each session repeatedly walks through the board like a manager would:
+filter and search the summary, browse the Supply Pool, approve a request and
+submit a transfer. Every rerun is timed, and for each session count the
+harness reports p50/p95/p99 rerun latency, throughput and memory per session.
+
+Usage:
+    python load_test.py --sessions 1 5 10 20 --rounds 3
+    python load_test.py --employees 3000 --sheets-latency 0.5 --image-latency 0.1
+"""
+import argparse
+import contextlib
+import logging
+import os
+import random
+import resource
+import tempfile
+import threading
+import time
+import warnings
+from io import BytesIO
+from unittest import mock
+
+import numpy as np
+import gspread
+import streamlit
+import requests
+from google.oauth2.service_account import Credentials
+from PIL import Image
+from streamlit.runtime import Runtime
+from streamlit.runtime.secrets import Secrets
+from streamlit.testing.v1 import AppTest
+
+APP_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "RAB.py")
+
+EMPLOYEE_SHEET_NAME = "Employee Data"
+ADS_SHEET_NAME = "Employee ADS"
+
+ACCOUNTS = [
+    "Bristol-Myers Squibb", "J&J", "Abbvie", "Gilead Sciences  Inc.", "RECURSION",
+    "Novartis", "Sanofi", "Abbott Laboratories", "Loyalty Pacific", "Coles"
+]
+DESIGNATIONS = ["TDS1", "TDS2", "TDS3", "TDS4", "AL", "-"]
+BILLABILITY = ["PU - Person Unbilled", "-", "PI - Person Investment", "PB - Person Billed"]
+SKILLS = ["Python", "SQL", "Power BI", "Azure", "PySpark", "Tableau", "Machine Learning", "AWS"]
+STATUSES = ["Pending", "Approved", "Rejected"]
+
+
+#######################################
+# --- Fake Backends ---
+#######################################
+
+def build_employee_values(n_employees, seed=0):
+    rng = random.Random(seed)
+    values = [["Employee Id", "Employee Name", "Account Name", "Designation", "Rank",
+               "Skillset", "Current Billability", "Tenure", "Manager Name"]]
+    for i in range(n_employees):
+        values.append([
+            100000 + i,
+            f"Employee {i}",
+            rng.choice(ACCOUNTS),
+            rng.choice(DESIGNATIONS),
+            f"R{rng.randint(1, 5)}",
+            ", ".join(rng.sample(SKILLS, 3)),
+            rng.choice(BILLABILITY),
+            rng.randint(1, 80),
+            f"Manager {i % 25}",
+        ])
+    return values
+
+
+def build_ads_values(n_employees, n_requests, seed=0):
+    rng = random.Random(seed + 1)
+    values = [["Employee Id", "Employee Name", "Account Name", "Designation", "Delivery Owner",
+               "P&L Owner Mapping", "Interested Manager", "Employee to Swap", "Request Id", "Status"]]
+    for i in range(n_requests):
+        emp = rng.randrange(n_employees)
+        swap = rng.randrange(n_employees)
+        values.append([
+            100000 + emp,
+            f"Employee {emp}",
+            rng.choice(ACCOUNTS),
+            rng.choice(DESIGNATIONS),
+            "Delivery Owner",
+            "P&L Owner",
+            f"Manager {i % 25}",
+            f"Employee {swap}",
+            500000000 + i,
+            rng.choice(STATUSES),
+        ])
+    return values
+
+
+class FakeSpreadsheet:
+    """
+    In-memory stand-in for gspread.Spreadsheet. Every API call sleeps for the
+    configured latency and is counted.
+    """
+    def __init__(self, sheets, latency=0.0):
+        self.sheets = sheets
+        self.latency = latency
+        self.lock = threading.Lock()
+        self.calls = {}
+
+    def _request(self, name):
+        with self.lock:
+            self.calls[name] = self.calls.get(name, 0) + 1
+        if self.latency:
+            time.sleep(self.latency)
+
+    def worksheet(self, title):
+        self._request("worksheet")
+        return FakeWorksheet(self, title)
+
+    def values_get(self, range_name, params=None):
+        self._request("values_get")
+        return {"range": range_name, "values": self.sheets[range_name.strip("'")]}
+
+    def values_batch_get(self, ranges, params=None):
+        self._request("values_batch_get")
+        return {"valueRanges": [{"range": r, "values": self.sheets[r.strip("'")]} for r in ranges]}
+
+
+class FakeWorksheet:
+    def __init__(self, spreadsheet, title):
+        self.spreadsheet = spreadsheet
+        self.title = title
+
+    @property
+    def row_count(self):
+        return len(self.spreadsheet.sheets[self.title])
+
+    @property
+    def col_count(self):
+        return max(len(row) for row in self.spreadsheet.sheets[self.title])
+
+    def update_cells(self, cells, value_input_option=None):
+        # Writes are counted but not applied so every round sees the same data
+        self.spreadsheet._request("update_cells")
+
+    def resize(self, rows=None, cols=None):
+        self.spreadsheet._request("resize")
+
+    def clear(self):
+        self.spreadsheet._request("clear")
+
+
+class FakeClient:
+    def __init__(self, spreadsheet):
+        self.spreadsheet = spreadsheet
+
+    def open_by_key(self, key):
+        self.spreadsheet._request("open_by_key")
+        return self.spreadsheet
+
+
+class FakeImageResponse:
+    def __init__(self, content):
+        self.status_code = 200
+        self.content = content
+
+
+def make_image_get(latency):
+    buffered = BytesIO()
+    Image.new("RGB", (110, 120), (192, 192, 192)).save(buffered, format="PNG")
+    content = buffered.getvalue()
+
+    def fake_get(url, headers=None, params=None, timeout=None):
+        if latency:
+            time.sleep(latency)
+        return FakeImageResponse(content)
+
+    return fake_get
+
+
+@contextlib.contextmanager
+def fake_backends(spreadsheet, image_latency):
+    # Installed once for all sessions; AppTest's per-run secrets swap is not thread-safe
+    secrets = Secrets()
+    secrets._secrets = {"google_service_account": {}}
+    with contextlib.ExitStack() as stack:
+        # Fake data must never replace the real snapshots next to RAB.py
+        snapshot_dir = stack.enter_context(tempfile.TemporaryDirectory())
+        stack.enter_context(mock.patch.dict(os.environ, {"RAB_SNAPSHOT_DIR": snapshot_dir}))
+        stack.enter_context(mock.patch.object(streamlit, "secrets", secrets))
+        stack.enter_context(mock.patch.object(gspread, "authorize", lambda credentials: FakeClient(spreadsheet)))
+        stack.enter_context(mock.patch.object(Credentials, "from_service_account_info", lambda info, scopes=None: object()))
+        stack.enter_context(mock.patch.object(requests, "get", make_image_get(image_latency)))
+        yield
+
+
+@contextlib.contextmanager
+def shared_runtime():
+    """
+    AppTest installs a mock Runtime for the length of one run and then resets
+    it to None, which breaks other sessions running at the same time. Keep
+    handing out the last installed runtime instead.
+    """
+    last = {}
+
+    def instance(cls):
+        if cls._instance is not None:
+            last["runtime"] = cls._instance
+        return last["runtime"]
+
+    with mock.patch.object(Runtime, "instance", classmethod(instance)), \
+            mock.patch.object(Runtime, "exists", classmethod(lambda cls: True)):
+        yield
+
+
+#######################################
+# --- Simulated Session ---
+#######################################
+
+def find(elements, label):
+    for element in elements:
+        if element.label == label:
+            return element
+    return None
+
+
+class Session:
+    """
+    One simulated manager. Every call to a widget's run() is timed.
+    """
+    def __init__(self, session_no, timeout):
+        self.rng = random.Random(session_no)
+        self.at = AppTest.from_file(APP_FILE, default_timeout=timeout)
+        self.latencies = []
+        self.errors = []
+
+    def run(self, target=None):
+        start = time.perf_counter()
+        (target or self.at).run()
+        self.latencies.append(time.perf_counter() - start)
+        self.errors.extend(e.message for e in self.at.exception)
+
+    def click(self, label):
+        button = find(self.at.button, label)
+        if button is not None:
+            self.run(button.click())
+
+    def pick(self, widget, skip_first=False):
+        if widget is None or not widget.options:
+            return
+        options = widget.options[1:] if skip_first and len(widget.options) > 1 else widget.options
+        self.run(widget.set_value(self.rng.choice(options)))
+
+    def walk(self):
+        at = self.at
+
+        # --- Transfer Summary: filter and search ---
+        self.click("📊 Transfer Summary")
+        account = find(at.sidebar.multiselect, "Account Name")
+        if account is not None and account.options:
+            self.run(account.set_value([self.rng.choice(account.options)]))
+        search = find(at.sidebar.text_input, "Search Employee Name or ID")
+        if search is not None:
+            self.run(search.input(f"Employee {self.rng.randint(0, 9)}"))
+            self.run(find(at.sidebar.text_input, "Search Employee Name or ID").input(""))
+
+        # --- Supply Pool: filter, then express interest ---
+        self.click("📝 Supply Pool")
+        self.pick(find(at.sidebar.multiselect, "Designation"))
+        interested = [b for b in at.button if b.label == "Interested in Employee"]
+        if interested:
+            self.run(self.rng.choice(interested).click())
+
+        # --- Transfer Requests: approve a pending request ---
+        self.click("🔁 Transfer Requests")
+        self.pick(at.selectbox(key="request_id_select_tab2"))
+        self.run(at.button(key="submit_decision").click())
+
+        # --- Employee Transfer Form: submit a request ---
+        self.click("✏️ Employee Transfer Form")
+        self.pick(at.selectbox(key="user_name_add"), skip_first=True)
+        for key in ["interested_employee_add", "employee_to_swap_add"]:
+            self.run(at.text_input(key=f"{key}_query").input(f"Employee {self.rng.randint(1, 9)}"))
+            self.pick(at.selectbox(key=key), skip_first=True)
+        self.run(at.button(key="submit_add").click())
+
+
+#######################################
+# --- Runner & Report ---
+#######################################
+
+def rss_mb():
+    """
+    Current resident memory in MB (peak RSS where /proc is unavailable).
+    """
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / 1e6
+    except OSError:
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1e3
+
+
+def run_load(n_sessions, rounds, timeout):
+    rss_before = rss_mb()
+    sessions = [Session(i, timeout) for i in range(n_sessions)]
+
+    def drive(session):
+        session.run()
+        for _ in range(rounds):
+            session.walk()
+
+    threads = [threading.Thread(target=drive, args=(s,)) for s in sessions]
+    start = time.perf_counter()
+    # The app prints on every image fetch; keep the report readable
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+    elapsed = time.perf_counter() - start
+
+    latencies = np.array([x for s in sessions for x in s.latencies]) * 1000
+    errors = [e for s in sessions for e in s.errors]
+    return {
+        "sessions": n_sessions,
+        "reruns": len(latencies),
+        "errors": errors,
+        "p50": np.percentile(latencies, 50),
+        "p95": np.percentile(latencies, 95),
+        "p99": np.percentile(latencies, 99),
+        "throughput": len(latencies) / elapsed,
+        "mem_per_session": (rss_mb() - rss_before) / n_sessions,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Concurrent multi-session load test for RAB.py")
+    parser.add_argument("--sessions", type=int, nargs="+", default=[1, 5, 10, 20], help="session counts to test")
+    parser.add_argument("--rounds", type=int, default=2, help="page walks per session")
+    parser.add_argument("--employees", type=int, default=1000, help="rows in the fake Employee Data sheet")
+    parser.add_argument("--requests", type=int, default=200, help="rows in the fake Employee ADS sheet")
+    parser.add_argument("--sheets-latency", type=float, default=0.2, help="seconds per fake Sheets API call")
+    parser.add_argument("--image-latency", type=float, default=0.05, help="seconds per fake image request")
+    parser.add_argument("--timeout", type=float, default=120, help="seconds allowed per rerun")
+    args = parser.parse_args()
+
+    spreadsheet = FakeSpreadsheet(
+        {
+            EMPLOYEE_SHEET_NAME: build_employee_values(args.employees),
+            ADS_SHEET_NAME: build_ads_values(args.employees, args.requests),
+        },
+        latency=args.sheets_latency,
+    )
+
+    logging.getLogger("streamlit").setLevel(logging.CRITICAL)
+    warnings.filterwarnings("ignore")
+
+    errors = set()
+    print(f"{'sessions':>8} {'reruns':>7} {'errors':>6} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} "
+          f"{'reruns/s':>9} {'MB/session':>11}")
+    with fake_backends(spreadsheet, args.image_latency), shared_runtime():
+        for n_sessions in args.sessions:
+            r = run_load(n_sessions, args.rounds, args.timeout)
+            errors.update(r["errors"])
+            print(f"{r['sessions']:>8} {r['reruns']:>7} {len(r['errors']):>6} {r['p50']:>9.1f} {r['p95']:>9.1f} "
+                  f"{r['p99']:>9.1f} {r['throughput']:>9.2f} {r['mem_per_session']:>11.2f}")
+    print(f"Sheets API calls: {spreadsheet.calls}")
+    for error in sorted(errors):
+        print(f"App error: {error}")
+
+
+if __name__ == "__main__":
+    main()
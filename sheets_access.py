@@ -0,0 +1,367 @@
+"""
+Google Sheets access layer shared by every session of the board.
+
+Identical concurrent reads are coalesced into one in-flight call, every call
+spends from a per-minute token bucket, and 429/5xx errors back off with jitter
+while reads keep serving the last good result. Successful loads are also
+kept on disk as Arrow snapshots, so a restarted process can render at once.
+"""
+import json
+import logging
+import os
+import random
+import tempfile
+import threading
+import time
+from concurrent.futures import Future
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+from gspread.utils import absolute_range_name
+from pandas.io.parsers import TextParser
+
+logger = logging.getLogger(__name__)
+
+# Google Sheets allows ~60 requests per minute per user. Every session reruns the
+# whole script, so all Sheets calls go through one shared gateway.
+SHEETS_REQUESTS_PER_MINUTE = 60
+SHEETS_MAX_RETRIES = 4
+SHEETS_BACKOFF_BASE = 1.0    # seconds
+SHEETS_BACKOFF_CAP = 32.0    # seconds
+
+
+def is_retryable_sheets_error(error):
+    """
+    True for quota (429) and server-side (5xx) errors from the Sheets API.
+    """
+    status = getattr(getattr(error, "response", None), "status_code", None)
+    return status is not None and (status == 429 or status >= 500)
+
+
+def values_to_dataframe(values):
+    """
+    Build a DataFrame from a raw Sheets value grid (header row first), parsed
+    the same way get_as_dataframe does: numeric-looking text becomes numbers,
+    duplicate headers are renamed (A, A.1), and empty rows and empty unnamed
+    columns are dropped. Unlike get_as_dataframe it never sees the sheet's
+    blank trailing rows, so whole-number columns stay int64 instead of float64.
+    """
+    if not values:
+        return pd.DataFrame()
+
+    # Sheets trims trailing empty cells, so pad every row to the widest one
+    width = max(len(row) for row in values)
+    rows = [row + [""] * (width - len(row)) for row in values]
+
+    frame = TextParser(rows).read().dropna(how="all")
+    empty_unnamed = [col for col in frame.columns
+                     if str(col).startswith("Unnamed: ") and frame[col].isna().all()]
+    return frame.drop(columns=empty_unnamed)
+
+
+def fetch_sheets(client, sheet_id, sheet_names):
+    """
+    Read the named worksheets with one open_by_key and one values_batch_get
+    call, returning a DataFrame per name in the same order.
+    """
+    spreadsheet = client.open_by_key(sheet_id)
+    response = spreadsheet.values_batch_get(
+        [absolute_range_name(name) for name in sheet_names],
+        params={"valueRenderOption": "UNFORMATTED_VALUE", "dateTimeRenderOption": "FORMATTED_STRING"}
+    )
+    return [values_to_dataframe(value_range.get("values", [])) for value_range in response["valueRanges"]]
+
+
+class TokenBucket:
+    """
+    Per-minute request budget, refilled continuously.
+    """
+    def __init__(self, per_minute):
+        self.capacity = float(per_minute)
+        self.rate = per_minute / 60.0
+        self.tokens = float(per_minute)
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def try_acquire(self, cost=1):
+        cost = min(cost, self.capacity)
+        with self.lock:
+            self._refill()
+            if self.tokens >= cost:
+                self.tokens -= cost
+                return True
+            return False
+
+    def acquire(self, cost=1):
+        cost = min(cost, self.capacity)
+        while not self.try_acquire(cost):
+            with self.lock:
+                wait = (cost - self.tokens) / self.rate
+            time.sleep(max(wait, 0.01))
+
+
+class SheetsGateway:
+    """
+    One instance is shared by all sessions; see the module docstring. Reads
+    served from the last good result are flagged stale with their fetch time.
+    """
+    def __init__(self, requests_per_minute=SHEETS_REQUESTS_PER_MINUTE, max_retries=SHEETS_MAX_RETRIES,
+                 backoff_base=SHEETS_BACKOFF_BASE, backoff_cap=SHEETS_BACKOFF_CAP):
+        self.bucket = TokenBucket(requests_per_minute)
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_cap = backoff_cap
+        self._lock = threading.Lock()
+        self._inflight = {}
+        self._refreshing = set()
+        self._last_good = {}
+        self._loaded_at = {}
+        self._fetched_at = {}
+        self._invalidated_at = {}
+        self._failures = 0
+        self._backoff_until = 0.0
+
+    def read(self, key, fetch, cost=1, max_age=None):
+        """
+        Return (value, as_of) for key, sharing one fetch() among concurrent
+        callers. A result fetched less than max_age seconds ago is reused.
+        as_of is None for current data; when the last good result is served
+        instead, it is the wall-clock time that result was fetched.
+        """
+        if max_age and self._is_fresh(key, max_age):
+            return self._last_good[key], None
+
+        with self._lock:
+            call = self._inflight.get(key)
+            leader = call is None
+            if leader:
+                call = Future()
+                self._inflight[key] = call
+
+        if leader:
+            try:
+                call.set_result(self._read(key, fetch, cost))
+            except Exception as e:
+                call.set_exception(e)
+            finally:
+                with self._lock:
+                    del self._inflight[key]
+        return call.result()
+
+    def read_fresh(self, key, fetch, cost=1):
+        """
+        Fetch key now and return the value, waiting out the budget and any
+        backoff instead of serving the last good result. Use this whenever
+        current data is required, e.g. around writes.
+        """
+        started = time.monotonic()
+        value = self._call(fetch, cost)
+        self._store(key, value, started)
+        return value
+
+    def invalidate(self, key):
+        """
+        Stop reusing key's result under max_age, so the next read tries
+        Sheets. While backing off or out of budget that read still returns
+        the last good result flagged stale; use read_fresh to force it.
+        """
+        with self._lock:
+            self._invalidated_at[key] = time.monotonic()
+
+    def has(self, key):
+        """
+        True once a read for key has succeeded in this process.
+        """
+        return key in self._last_good
+
+    def refresh(self, key, fetch, cost=1):
+        """
+        Read key on a background thread, unless a refresh is already running.
+        """
+        with self._lock:
+            if key in self._refreshing:
+                return
+            self._refreshing.add(key)
+
+        def run():
+            try:
+                self.read(key, fetch, cost)
+            except Exception as e:
+                logger.warning("Background refresh of %s failed: %s", key, e)
+            finally:
+                with self._lock:
+                    self._refreshing.discard(key)
+
+        threading.Thread(target=run, daemon=True).start()
+
+    def write(self, push, cost=1):
+        """
+        Run push() within the quota, retrying 429/5xx errors with backoff.
+        """
+        return self._call(push, cost)
+
+    def _is_fresh(self, key, max_age):
+        loaded_at = self._loaded_at.get(key)
+        return (loaded_at is not None and time.monotonic() - loaded_at < max_age
+                and loaded_at > self._invalidated_at.get(key, float("-inf")))
+
+    def _read(self, key, fetch, cost):
+        started = time.monotonic()
+        if key not in self._last_good:
+            value = self._call(fetch, cost)
+        elif self._cooling_down() or not self.bucket.try_acquire(cost):
+            return self._last_good[key], self._fetched_at[key]
+        else:
+            try:
+                value = fetch()
+            except Exception as e:
+                if not is_retryable_sheets_error(e):
+                    raise
+                self._back_off()
+                return self._last_good[key], self._fetched_at[key]
+            self._failures = 0
+        self._store(key, value, started)
+        return value, None
+
+    def _store(self, key, value, started):
+        self._last_good[key] = value
+        self._loaded_at[key] = started
+        self._fetched_at[key] = time.time()
+
+    def _call(self, fn, cost):
+        for attempt in range(self.max_retries + 1):
+            time.sleep(max(0.0, self._backoff_until - time.monotonic()))
+            self.bucket.acquire(cost)
+            try:
+                result = fn()
+            except Exception as e:
+                if attempt == self.max_retries or not is_retryable_sheets_error(e):
+                    raise
+                self._back_off()
+            else:
+                self._failures = 0
+                return result
+
+    def _cooling_down(self):
+        return time.monotonic() < self._backoff_until
+
+    def _back_off(self):
+        with self._lock:
+            self._failures += 1
+            delay = min(self.backoff_cap, self.backoff_base * 2 ** (self._failures - 1))
+            # Equal jitter: half the delay is fixed, half is random
+            until = time.monotonic() + delay / 2 + random.uniform(0, delay / 2)
+            self._backoff_until = max(self._backoff_until, until)
+
+
+# Frames last written per (directory, sheet_id, sheet_name), to skip rewriting
+# unchanged data. Snapshots are saved from the gateway's background threads.
+_saved_snapshots = {}
+_saved_snapshots_lock = threading.Lock()
+
+
+def snapshot_path(directory, sheet_id, sheet_name):
+    return os.path.join(directory, sheet_id, f"{sheet_name}.arrow")
+
+
+def to_arrow_table(frame):
+    """
+    Convert a DataFrame to Arrow. Mixed-type object columns (e.g. numbers
+    and "-") are stored as JSON text and listed in the "json_columns" metadata.
+    """
+    frame = frame.copy()
+    json_columns = []
+    for col in frame.columns[frame.dtypes == object]:
+        try:
+            pa.array(frame[col], from_pandas=True)
+        except (pa.ArrowInvalid, pa.ArrowTypeError):
+            frame[col] = frame[col].map(json.dumps, na_action="ignore")
+            json_columns.append(col)
+    table = pa.Table.from_pandas(frame)
+    return table.replace_schema_metadata({
+        **table.schema.metadata,
+        b"json_columns": json.dumps(json_columns).encode(),
+    })
+
+
+def from_arrow_table(table):
+    """
+    Inverse of to_arrow_table. Missing values in object columns come back
+    as NaN, as values_to_dataframe gives them, rather than None.
+    """
+    frame = table.to_pandas()
+    for col in json.loads(table.schema.metadata[b"json_columns"]):
+        frame[col] = frame[col].map(json.loads, na_action="ignore")
+    for col in frame.columns[frame.dtypes == object]:
+        frame[col] = frame[col].mask(frame[col].isna(), np.nan)
+    return frame
+
+
+def _replace_atomically(path, write):
+    """
+    Call write(tmp_path) on a uniquely named file next to path, then swap
+    it into place, so overlapping writers never share a temp file.
+    """
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), prefix=os.path.basename(path), suffix=".tmp")
+    os.close(fd)
+    try:
+        write(tmp_path)
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+
+
+def save_snapshot(directory, sheet_id, sheet_names, frames, loaded_at):
+    """
+    Write each frame to its snapshot file and its load time to a small
+    ".loaded_at" sidecar. Unchanged data is not rewritten, but the sidecar
+    is, so the load time stays current.
+    """
+    def write_table(table):
+        def write(tmp_path):
+            with pa.OSFile(tmp_path, "wb") as sink:
+                with pa.ipc.new_file(sink, table.schema) as writer:
+                    writer.write_table(table)
+        return write
+
+    def write_loaded_at(tmp_path):
+        with open(tmp_path, "w") as f:
+            f.write(str(loaded_at))
+
+    with _saved_snapshots_lock:
+        for sheet_name, frame in zip(sheet_names, frames):
+            key = (directory, sheet_id, sheet_name)
+            path = snapshot_path(directory, sheet_id, sheet_name)
+            try:
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+                if key not in _saved_snapshots or not _saved_snapshots[key].equals(frame):
+                    _replace_atomically(path, write_table(to_arrow_table(frame)))
+                    _saved_snapshots[key] = frame
+                _replace_atomically(path + ".loaded_at", write_loaded_at)
+            except Exception as e:
+                logger.warning("Could not save snapshot of %s: %s", sheet_name, e)
+
+
+def load_snapshot(directory, sheet_id, sheet_names):
+    """
+    Return (frames, loaded_at) from the memory-mapped snapshot files, or None
+    if any of them is missing or unreadable. loaded_at is the oldest load time.
+    """
+    frames, loaded_at = [], []
+    try:
+        for sheet_name in sheet_names:
+            path = snapshot_path(directory, sheet_id, sheet_name)
+            with pa.memory_map(path, "r") as source:
+                frames.append(from_arrow_table(pa.ipc.open_file(source).read_all()))
+            with open(path + ".loaded_at") as f:
+                loaded_at.append(float(f.read()))
+    except (OSError, KeyError, ValueError, pa.ArrowInvalid):
+        return None
+    return frames, min(loaded_at)
@@ -0,0 +1,35 @@
+import pandas as pd
+import pytest
+
+from employee_lookup import build_employee_lookup, search_employee_lookup
+
+
+@pytest.fixture
+def lookup():
+    return build_employee_lookup(pd.DataFrame({
+        "Employee Id": [100001, 100002, 100012, 200001, 100003],
+        "Employee Name": ["Ann Annand", "Bob Stone", "Cy Bobbin", "Dee Ray", None],
+    }))
+
+
+def test_id_prefix(lookup):
+    assert search_employee_lookup(lookup, "10000") == ["100001 - Ann Annand", "100002 - Bob Stone"]
+
+
+def test_later_name_word_prefix(lookup):
+    assert search_employee_lookup(lookup, "STO") == ["100002 - Bob Stone"]
+    assert search_employee_lookup(lookup, "bob") == ["100002 - Bob Stone", "100012 - Cy Bobbin"]
+
+
+def test_employee_matching_twice_is_returned_once(lookup):
+    # "ann" matches both the full name and the later word "annand"
+    assert search_employee_lookup(lookup, "ann") == ["100001 - Ann Annand"]
+
+
+def test_limit(lookup):
+    assert len(search_employee_lookup(lookup, "1", limit=2)) == 2
+    assert search_employee_lookup(lookup, "", limit=3) == lookup[0][:3]
+
+
+def test_missing_names_are_not_offered(lookup):
+    assert search_employee_lookup(lookup, "100003") == []
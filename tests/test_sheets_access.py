@@ -0,0 +1,208 @@
+import threading
+import time
+from unittest import mock
+
+import pytest
+
+from sheets_access import SheetsGateway, TokenBucket, fetch_sheets
+
+
+class FakeAPIError(Exception):
+    def __init__(self, status_code):
+        super().__init__(f"HTTP {status_code}")
+        self.response = mock.Mock(status_code=status_code)
+
+
+class FakeWorksheet:
+    """
+    Counts fetches; fails with `error` while it is set.
+    """
+    def __init__(self, latency=0.0):
+        self.latency = latency
+        self.calls = 0
+        self.error = None
+        self.lock = threading.Lock()
+
+    def fetch(self):
+        with self.lock:
+            self.calls += 1
+            version = self.calls
+        time.sleep(self.latency)
+        if self.error is not None:
+            raise self.error
+        return {"version": version}
+
+
+class CountingClient:
+    """
+    Fake gspread client that records every call and serves one grid per
+    worksheet title.
+    """
+    def __init__(self, sheets):
+        self.sheets = sheets
+        self.calls = []
+
+    def open_by_key(self, sheet_id):
+        self.calls.append(("open_by_key", sheet_id))
+        return self
+
+    def values_batch_get(self, ranges, params=None):
+        self.calls.append(("values_batch_get", ranges))
+        return {"valueRanges": [{"range": r, "values": self.sheets[r.strip("'")]} for r in ranges]}
+
+
+def run_sessions(n, target):
+    barrier = threading.Barrier(n)
+    results = [None] * n
+
+    def session(i):
+        barrier.wait()
+        results[i] = target()
+
+    threads = [threading.Thread(target=session, args=(i,)) for i in range(n)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    return results
+
+
+def test_concurrent_identical_reads_share_one_fetch():
+    sheet = FakeWorksheet(latency=0.2)
+    gateway = SheetsGateway()
+
+    results = run_sessions(25, lambda: gateway.read("ads", sheet.fetch))
+
+    assert sheet.calls == 1
+    assert all(value is results[0][0] and as_of is None for value, as_of in results)
+
+
+def test_different_keys_are_not_coalesced():
+    sheet = FakeWorksheet(latency=0.1)
+    gateway = SheetsGateway()
+
+    run_sessions(4, lambda: gateway.read(threading.get_ident(), sheet.fetch))
+
+    assert sheet.calls == 4
+
+
+@pytest.mark.parametrize("status_code", [429, 500, 503])
+def test_retryable_error_backs_off_and_serves_last_good(status_code):
+    sheet = FakeWorksheet()
+    gateway = SheetsGateway(backoff_base=10)
+    good, _ = gateway.read("ads", sheet.fetch)
+
+    sheet.error = FakeAPIError(status_code)
+    value, as_of = gateway.read("ads", sheet.fetch)
+
+    assert value is good
+    assert as_of is not None
+    assert sheet.calls == 2
+
+    # Still backing off: served from the last good result without calling Sheets
+    results = run_sessions(10, lambda: gateway.read("ads", sheet.fetch))
+    assert sheet.calls == 2
+    assert all(value is good and as_of is not None for value, as_of in results)
+
+
+def test_non_retryable_error_is_raised():
+    sheet = FakeWorksheet()
+    gateway = SheetsGateway()
+    gateway.read("ads", sheet.fetch)
+
+    sheet.error = FakeAPIError(403)
+    with pytest.raises(FakeAPIError):
+        gateway.read("ads", sheet.fetch)
+
+
+def test_first_read_retries_with_backoff_then_raises():
+    sheet = FakeWorksheet()
+    sheet.error = FakeAPIError(429)
+    gateway = SheetsGateway(max_retries=2, backoff_base=0.05)
+
+    start = time.monotonic()
+    with pytest.raises(FakeAPIError):
+        gateway.read("ads", sheet.fetch)
+
+    assert sheet.calls == 3
+    # Equal jitter waits at least half of 0.05 + 0.1
+    assert time.monotonic() - start >= 0.075
+
+
+def test_recovers_after_backoff():
+    sheet = FakeWorksheet()
+    gateway = SheetsGateway(backoff_base=0.05)
+    gateway.read("ads", sheet.fetch)
+    sheet.error = FakeAPIError(429)
+    gateway.read("ads", sheet.fetch)
+
+    sheet.error = None
+    time.sleep(0.06)
+    value, as_of = gateway.read("ads", sheet.fetch)
+
+    assert value == {"version": 3}
+    assert as_of is None
+
+
+def test_bucket_blocks_once_budget_is_spent():
+    bucket = TokenBucket(per_minute=600)    # 10 tokens per second
+    assert bucket.try_acquire(600)
+    assert not bucket.try_acquire(1)
+
+    start = time.monotonic()
+    bucket.acquire(5)
+    assert time.monotonic() - start >= 0.4
+
+
+def test_spent_budget_serves_last_good_without_fetching():
+    sheet = FakeWorksheet()
+    gateway = SheetsGateway(requests_per_minute=6)
+    good, _ = gateway.read("ads", sheet.fetch, cost=3)
+    gateway.read("ads", sheet.fetch, cost=3)
+
+    value, as_of = gateway.read("ads", sheet.fetch, cost=3)
+
+    assert sheet.calls == 2
+    assert value == {"version": 2}
+    assert as_of is not None
+    assert good == {"version": 1}
+
+
+def test_read_after_invalidate_is_flagged_stale_when_budget_is_spent():
+    sheet = FakeWorksheet()
+    gateway = SheetsGateway(requests_per_minute=600)
+    gateway.read("ads", sheet.fetch, cost=2, max_age=60)
+    assert gateway.bucket.try_acquire(gateway.bucket.capacity - 2)
+
+    gateway.invalidate("ads")
+    value, as_of = gateway.read("ads", sheet.fetch, cost=2, max_age=60)
+
+    assert value == {"version": 1}
+    assert as_of is not None
+
+
+def test_read_fresh_waits_for_budget_and_updates_last_good():
+    sheet = FakeWorksheet()
+    gateway = SheetsGateway(requests_per_minute=600)
+    gateway.read("ads", sheet.fetch, cost=2, max_age=60)
+    assert gateway.bucket.try_acquire(gateway.bucket.capacity - 2)
+
+    assert gateway.read_fresh("ads", sheet.fetch, cost=2) == {"version": 2}
+    assert gateway.read("ads", sheet.fetch, cost=2, max_age=60) == ({"version": 2}, None)
+
+
+def test_fetch_sheets_makes_one_batch_call_per_load():
+    client = CountingClient({
+        "Employee Data": [["Employee Id", "Employee Name"], [100001, "Ann"]],
+        "Employee ADS": [["Request Id", "Status"], [500000001, "Pending"], [500000002, "Approved"]],
+        "Unused": [["Other"], [1]],
+    })
+
+    ads, employees = fetch_sheets(client, "sheet-id", ("Employee ADS", "Employee Data"))
+
+    assert client.calls == [
+        ("open_by_key", "sheet-id"),
+        ("values_batch_get", ["'Employee ADS'", "'Employee Data'"]),
+    ]
+    assert ads["Status"].tolist() == ["Pending", "Approved"]
+    assert employees["Employee Name"].tolist() == ["Ann"]
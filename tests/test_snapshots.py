@@ -0,0 +1,117 @@
+import os
+import threading
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from sheets_access import load_snapshot, save_snapshot, snapshot_path, values_to_dataframe
+
+SHEET_ID = "sheet-id"
+SHEET_NAMES = ("Employee Data", "Employee ADS")
+
+
+def employee_frame():
+    return values_to_dataframe([
+        ["Employee Id", "Employee Name", "Tenure", "Skillset"],
+        [100001, "Ann", 12, "Python"],
+        ["100002", "", "-", ""],
+        [100003, "Cy", 40, "SQL"],
+        [],
+        [100004, "Dee", "", "Go"],
+    ])
+
+
+def ads_frame():
+    return values_to_dataframe([
+        ["Employee Id", "Request Id", "Status"],
+        [100001, 500000001, "Pending"],
+        [100003, 500000002, ""],
+    ])
+
+
+@pytest.fixture
+def frames():
+    return [employee_frame(), ads_frame()]
+
+
+def test_round_trip_matches_live_frames(tmp_path, frames):
+    save_snapshot(str(tmp_path), SHEET_ID, SHEET_NAMES, frames, 100.0)
+
+    loaded, loaded_at = load_snapshot(str(tmp_path), SHEET_ID, SHEET_NAMES)
+
+    assert loaded_at == 100.0
+    for frame, expected in zip(loaded, frames):
+        pd.testing.assert_frame_equal(frame, expected)
+
+
+def test_mixed_column_keeps_numbers_and_text(tmp_path, frames):
+    save_snapshot(str(tmp_path), SHEET_ID, SHEET_NAMES, frames, 100.0)
+
+    tenure = load_snapshot(str(tmp_path), SHEET_ID, SHEET_NAMES)[0][0]["Tenure"]
+
+    assert tenure.iloc[:3].tolist() == [12, "-", 40]
+    assert pd.isna(tenure.iloc[3])
+
+
+def test_missing_text_loads_as_nan(tmp_path, frames):
+    save_snapshot(str(tmp_path), SHEET_ID, SHEET_NAMES, frames, 100.0)
+
+    employees = load_snapshot(str(tmp_path), SHEET_ID, SHEET_NAMES)[0][0]
+
+    assert employees["Skillset"].astype(str).tolist() == ["Python", "nan", "SQL", "Go"]
+    assert employees["Employee Name"].isna().tolist() == [False, True, False, False]
+
+
+def test_unchanged_data_refreshes_load_time_only(tmp_path, frames):
+    save_snapshot(str(tmp_path), SHEET_ID, SHEET_NAMES, frames, 100.0)
+    path = snapshot_path(str(tmp_path), SHEET_ID, SHEET_NAMES[0])
+    os.utime(path, (1, 1))
+
+    save_snapshot(str(tmp_path), SHEET_ID, SHEET_NAMES, [employee_frame(), ads_frame()], 200.0)
+
+    assert os.path.getmtime(path) == 1
+    assert load_snapshot(str(tmp_path), SHEET_ID, SHEET_NAMES)[1] == 200.0
+
+
+def test_load_time_is_the_oldest_sheet(tmp_path, frames):
+    save_snapshot(str(tmp_path), SHEET_ID, SHEET_NAMES, frames, 100.0)
+    save_snapshot(str(tmp_path), SHEET_ID, SHEET_NAMES[1:], frames[1:], 200.0)
+
+    assert load_snapshot(str(tmp_path), SHEET_ID, SHEET_NAMES)[1] == 100.0
+
+
+@pytest.mark.parametrize("suffix", ["", ".loaded_at"])
+def test_missing_file_returns_none(tmp_path, frames, suffix):
+    save_snapshot(str(tmp_path), SHEET_ID, SHEET_NAMES, frames, 100.0)
+    os.remove(snapshot_path(str(tmp_path), SHEET_ID, SHEET_NAMES[1]) + suffix)
+
+    assert load_snapshot(str(tmp_path), SHEET_ID, SHEET_NAMES) is None
+
+
+@pytest.mark.parametrize("suffix, keep", [("", 0.5), (".loaded_at", 0)])
+def test_truncated_file_returns_none(tmp_path, frames, suffix, keep):
+    save_snapshot(str(tmp_path), SHEET_ID, SHEET_NAMES, frames, 100.0)
+    path = snapshot_path(str(tmp_path), SHEET_ID, SHEET_NAMES[0]) + suffix
+    with open(path, "r+b") as f:
+        f.truncate(int(os.path.getsize(path) * keep))
+
+    assert load_snapshot(str(tmp_path), SHEET_ID, SHEET_NAMES) is None
+
+
+def test_overlapping_saves_leave_a_readable_snapshot(tmp_path):
+    versions = [[employee_frame().iloc[: i % 4 + 1], ads_frame()] for i in range(8)]
+    barrier = threading.Barrier(len(versions))
+
+    def save(i):
+        barrier.wait()
+        save_snapshot(str(tmp_path), SHEET_ID, SHEET_NAMES, versions[i], float(i))
+
+    threads = [threading.Thread(target=save, args=(i,)) for i in range(len(versions))]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert load_snapshot(str(tmp_path), SHEET_ID, SHEET_NAMES) is not None
+    assert not [name for name in os.listdir(tmp_path / SHEET_ID) if name.endswith(".tmp")]
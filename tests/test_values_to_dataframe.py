@@ -0,0 +1,74 @@
+import pandas as pd
+import pytest
+from gspread_dataframe import get_as_dataframe
+
+from sheets_access import values_to_dataframe
+
+
+class FakeSpreadsheet:
+    def __init__(self, values):
+        self.values = values
+
+    def values_get(self, range_name, params=None):
+        return {"values": self.values}
+
+
+class FakeWorksheet:
+    """
+    Just enough of gspread.Worksheet for get_as_dataframe, sized to its data
+    (values_batch_get never returns the sheet's blank trailing rows).
+    """
+    def __init__(self, values):
+        self.spreadsheet = FakeSpreadsheet(values)
+        self.title = "Sheet1"
+        self.row_count = len(values)
+        self.col_count = max(len(row) for row in values)
+
+
+GRIDS = {
+    "numeric text": [
+        ["Employee ID", "Name", "Tenure"],
+        ["100001", "Ann", "1.5"],
+        [100002, "Bob", 3],
+        ["100003", "Cy", ""],
+    ],
+    "duplicate headers": [
+        ["A", "A", "B", "A"],
+        [1, 2, "x", "3"],
+        [4, 5, "y", 6],
+    ],
+    "gaps": [
+        ["Name", "", "Status", ""],
+        ["Ann", "", "Approved"],
+        [],
+        ["", "", ""],
+        ["Bob", "", "", ""],
+    ],
+    "mixed text": [
+        ["Tenure", "Date"],
+        [2, "1/5/2024"],
+        ["-", "2/5/2024"],
+        ["", ""],
+    ],
+    "header only": [["Name", "Status"]],
+}
+
+
+@pytest.mark.parametrize("values", GRIDS.values(), ids=GRIDS.keys())
+def test_matches_get_as_dataframe(values):
+    expected = get_as_dataframe(FakeWorksheet(values), evaluate_formulas=True).dropna(how="all")
+
+    pd.testing.assert_frame_equal(values_to_dataframe(values), expected)
+
+
+def test_numeric_text_becomes_numbers():
+    frame = values_to_dataframe(GRIDS["numeric text"])
+
+    assert frame["Employee ID"].dtype == "int64"
+    assert frame["Employee ID"].tolist() == [100001, 100002, 100003]
+
+
+def test_duplicate_headers_are_renamed():
+    frame = values_to_dataframe(GRIDS["duplicate headers"])
+
+    assert list(frame.columns) == ["A", "A.1", "B", "A.2"]